@@ -1,16 +1,24 @@
 from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from collections import OrderedDict, deque
+import functools
+import string
+import time
 import uuid
+from urllib.parse import quote
 from datetime import datetime, timezone
 import aiohttp
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
 import asyncio
 
 
@@ -19,16 +27,35 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# tz_aware so created_at comes back as UTC-aware datetimes, matching what create_source returns
+client = AsyncIOMotorClient(mongo_url, tz_aware=True, tzinfo=timezone.utc)
 db = client[os.environ['DB_NAME']]
 
-# Create the main app without a prefix
-app = FastAPI()
+# Create the main app without a prefix; orjson serializes responses (datetimes included)
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
 
+async def ensure_indexes():
+    """Create the indexes backing source lookups (no-op if they already exist)"""
+    await db.sources.create_index([("type", 1), ("enabled", 1)])
+    await db.sources.create_index("id", unique=True)
+
+async def migrate_created_at():
+    """Convert created_at values stored as ISO strings by older versions into BSON dates"""
+    cursor = db.sources.find({"created_at": {"$type": "string"}}, {"_id": 1, "created_at": 1})
+    async for doc in cursor:
+        try:
+            created_at = datetime.fromisoformat(doc['created_at'])
+        except ValueError:
+            # Leave the bad row as-is so it doesn't block the rest of startup
+            logger.error(f"Unparseable created_at on source {doc['_id']}: {doc['created_at']!r}")
+            continue
+        await db.sources.update_one({"_id": doc['_id']}, {"$set": {"created_at": created_at}})
+
+
 # Define Models
 class Source(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -69,66 +96,127 @@ class SearchResult(BaseModel):
     error: Optional[str] = None
 
 
+# Only the fields the Source model needs; skips decoding _id and any stray keys
+SOURCE_PROJECTION = {"_id": 0, **{field: 1 for field in Source.model_fields}}
+
+async def find_sources(query: Dict[str, Any], limit: int = 1000) -> List[Dict[str, Any]]:
+    """Load up to limit matching sources, projected to the Source model fields"""
+    cursor = db.sources.find(query, SOURCE_PROJECTION).limit(limit).batch_size(100)
+    return [source async for source in cursor]
+
+
+# Enabled sources grouped by type, kept in-process so /search skips Mongo
+SOURCE_CACHE: Dict[str, List[Dict[str, Any]]] = {}
+# Every source (enabled or not) by id, for point lookups
+SOURCE_BY_ID: Dict[str, Dict[str, Any]] = {}
+# Both caches are reloaded after writes and at least every SOURCE_CACHE_TTL seconds,
+# so changes made outside this process show up within that window
+SOURCE_CACHE_TTL = 60
+SOURCE_CACHE_LOADED_AT: Optional[float] = None
+# Serializes TTL reloads so concurrent requests don't each run a full find({})
+SOURCE_CACHE_LOCK = asyncio.Lock()
+
+def compile_url_template(url_base: str) -> string.Template:
+    """Turn a '{query}' url_base into a Template so searches only substitute"""
+    return string.Template(url_base.replace('$', '$$').replace('{query}', '${q}'))
+
+async def refresh_source_cache():
+    """Reload the source caches from Mongo"""
+    by_type: Dict[str, List[Dict[str, Any]]] = {}
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for source in await find_sources({}):
+        source['_url_template'] = compile_url_template(source['url_base'])
+        by_id[source['id']] = source
+        if source['enabled']:
+            by_type.setdefault(source['type'], []).append(source)
+    
+    SOURCE_CACHE.clear()
+    SOURCE_CACHE.update(by_type)
+    SOURCE_BY_ID.clear()
+    SOURCE_BY_ID.update(by_id)
+    
+    global SOURCE_CACHE_LOADED_AT
+    SOURCE_CACHE_LOADED_AT = time.monotonic()
+
+def source_cache_expired() -> bool:
+    return SOURCE_CACHE_LOADED_AT is None or time.monotonic() - SOURCE_CACHE_LOADED_AT >= SOURCE_CACHE_TTL
+
+async def ensure_source_cache():
+    """Reload the source caches if they were never loaded or have expired"""
+    if not source_cache_expired():
+        return
+    
+    async with SOURCE_CACHE_LOCK:
+        # Another request may have reloaded while we waited for the lock
+        if source_cache_expired():
+            await refresh_source_cache()
+
+async def invalidate_source_caches():
+    """Reload the source caches and drop cached search results after a write"""
+    await refresh_source_cache()
+    SEARCH_RESULT_CACHE.clear()
+
+
 # Source CRUD endpoints
 @api_router.post("/sources", response_model=Source)
 async def create_source(input: SourceCreate):
-    source_dict = input.model_dump()
-    source_obj = Source(**source_dict)
+    # BSON dates only keep milliseconds; truncate so POST returns what later GETs will
+    now = datetime.now(timezone.utc)
+    created_at = now.replace(microsecond=now.microsecond // 1000 * 1000)
+    
+    # input is already validated; model_construct only fills in id
+    source_obj = Source.model_construct(**input.model_dump(), created_at=created_at)
     
     doc = source_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
     
     await db.sources.insert_one(doc)
+    await invalidate_source_caches()
     return source_obj
 
 @api_router.get("/sources", response_model=List[Source])
 async def get_sources():
-    sources = await db.sources.find({}, {"_id": 0}).to_list(1000)
-    
-    for source in sources:
-        if isinstance(source['created_at'], str):
-            source['created_at'] = datetime.fromisoformat(source['created_at'])
+    await ensure_source_cache()
     
-    return sources
+    return list(SOURCE_BY_ID.values())
 
 @api_router.get("/sources/by-type/{type}", response_model=List[Source])
 async def get_sources_by_type(type: str):
-    sources = await db.sources.find({"type": type, "enabled": True}, {"_id": 0}).to_list(1000)
+    await ensure_source_cache()
     
-    for source in sources:
-        if isinstance(source['created_at'], str):
-            source['created_at'] = datetime.fromisoformat(source['created_at'])
-    
-    return sources
+    return SOURCE_CACHE.get(type, [])
 
 @api_router.get("/sources/{id}", response_model=Source)
 async def get_source(id: str):
-    source = await db.sources.find_one({"id": id}, {"_id": 0})
+    await ensure_source_cache()
+    
+    source = SOURCE_BY_ID.get(id)
+    if source is None:
+        source = await db.sources.find_one({"id": id}, SOURCE_PROJECTION)
     
     if not source:
         raise HTTPException(status_code=404, detail="Source not found")
     
-    if isinstance(source['created_at'], str):
-        source['created_at'] = datetime.fromisoformat(source['created_at'])
-    
     return source
 
 @api_router.put("/sources/{id}", response_model=Source)
 async def update_source(id: str, input: SourceUpdate):
-    source = await db.sources.find_one({"id": id}, {"_id": 0})
-    
-    if not source:
-        raise HTTPException(status_code=404, detail="Source not found")
-    
     update_data = {k: v for k, v in input.model_dump().items() if v is not None}
     
     if update_data:
-        await db.sources.update_one({"id": id}, {"$set": update_data})
+        updated_source = await db.sources.find_one_and_update(
+            {"id": id},
+            {"$set": update_data},
+            projection=SOURCE_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+    else:
+        updated_source = await db.sources.find_one({"id": id}, SOURCE_PROJECTION)
     
-    updated_source = await db.sources.find_one({"id": id}, {"_id": 0})
+    if not updated_source:
+        raise HTTPException(status_code=404, detail="Source not found")
     
-    if isinstance(updated_source['created_at'], str):
-        updated_source['created_at'] = datetime.fromisoformat(updated_source['created_at'])
+    if update_data:
+        await invalidate_source_caches()
     
     return updated_source
 
@@ -139,89 +227,230 @@ async def delete_source(id: str):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Source not found")
     
+    await invalidate_source_caches()
     return {"message": "Source deleted successfully"}
 
 
 # Search functionality
-async def search_with_scraping(url: str, query: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+# Max sources fetched at once per /search request
+SEARCH_CONCURRENCY = 20
+
+# Max results per source, and how much of a scraped page is fed to the parser at a time
+SCRAPE_RESULT_LIMIT = 10
+SCRAPE_CHUNK_SIZE = 65536
+
+# Text nodes bs4's get_text() would return: everything except script/style contents
+SCRAPE_TEXT_XPATH = etree.XPath('.//text()[not(ancestor::script or ancestor::style)]')
+
+def element_text(elem) -> str:
+    """Equivalent of bs4's get_text(strip=True) for an lxml element"""
+    return ''.join(text.strip() for text in SCRAPE_TEXT_XPATH(elem))
+
+class ScrapedItemParser:
+    """Incremental HTML parser returning the text of each <tag> carrying item_class, in document order"""
+    
+    def __init__(self, tag: str, item_class: Optional[str], encoding: Optional[str] = None):
+        self.tag = tag
+        self.item_class = item_class
+        self.parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+        # Matches in document order as [element, text]; text is set once the element ends
+        self.pending: deque = deque()
+        # Matches whose end tag hasn't been seen yet, innermost last
+        self.open: List[list] = []
+    
+    def matches(self, elem) -> bool:
+        if elem.tag != self.tag:
+            return False
+        if self.item_class is None:
+            # find_all(tag, class_=None) only matches tags without a class attribute
+            return elem.get('class') is None
+        # Like bs4: match any single class or the whole class attribute
+        classes = (elem.get('class') or '').split()
+        return self.item_class in classes or ' '.join(classes) == self.item_class
+    
+    def feed(self, data: bytes) -> List[str]:
+        self.parser.feed(data)
+        return self.collect()
+    
+    def close(self) -> List[str]:
+        try:
+            self.parser.close()
+        except etree.XMLSyntaxError:
+            # Raised for an empty body; there is simply nothing to collect
+            pass
+        return self.collect()
+    
+    def collect(self) -> List[str]:
+        """Process pending parser events and return the names completed so far"""
+        names = []
+        for event, elem in self.parser.read_events():
+            if event == 'start':
+                if self.matches(elem):
+                    entry = [elem, None]
+                    self.pending.append(entry)
+                    self.open.append(entry)
+                continue
+            
+            if self.open and self.open[-1][0] is elem:
+                entry = self.open.pop()
+                entry[1] = element_text(elem)
+            
+            # Outside any open match nothing needs this subtree or its finished siblings
+            if not self.open:
+                elem.clear()
+                parent = elem.getparent()
+                while parent is not None and elem.getprevious() is not None:
+                    del parent[0]
+            
+            while self.pending and self.pending[0][1] is not None:
+                names.append(self.pending.popleft()[1])
+        return names
+
+async def stream_scraped_names(response: aiohttp.ClientResponse, tag: str, item_class: Optional[str], encoding: Optional[str] = None) -> List[str]:
+    """Parse the body as it downloads, stopping (and dropping the connection) once enough items are found"""
+    parser = ScrapedItemParser(tag, item_class, encoding=encoding)
+    names: List[str] = []
+    
+    async for chunk in response.content.iter_chunked(SCRAPE_CHUNK_SIZE):
+        names.extend(parser.feed(chunk))
+        if len(names) >= SCRAPE_RESULT_LIMIT:
+            response.close()
+            return names[:SCRAPE_RESULT_LIMIT]
+    
+    names.extend(parser.close())
+    return names[:SCRAPE_RESULT_LIMIT]
+
+async def search_with_scraping(session: aiohttp.ClientSession, url: str, query: str, config: Dict[str, Any], url_template: Optional[string.Template] = None) -> List[Dict[str, Any]]:
     """Basic scraping search - can be customized per source"""
     try:
-        async with aiohttp.ClientSession() as session:
-            search_url = url.format(query=query)
-            async with session.get(search_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status != 200:
-                    return []
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # This is a generic scraper - would need customization per site
-                results = []
-                
-                # Example: try to find common patterns
-                # In real implementation, each source would have custom selectors in config
-                items = soup.find_all(config.get('item_selector', 'div'), class_=config.get('item_class'))
-                
-                for item in items[:10]:  # Limit to 10 results
-                    result = {
-                        'name': item.get_text(strip=True) if item else 'N/A',
-                        'price': 'N/A',
-                        'size': 'N/A',
-                        'producer': 'N/A',
-                        'release_date': 'N/A',
-                        'image': config.get('default_image', ''),
-                        'link': url
-                    }
-                    results.append(result)
-                
-                return results
+        if url_template is None:
+            url_template = compile_url_template(url)
+        search_url = url_template.substitute(q=quote(query))
+        async with session.get(search_url) as response:
+            if response.status != 200:
+                return []
+            
+            # This is a generic scraper - would need customization per site
+            results = []
+            
+            # Example: try to find common patterns
+            # In real implementation, each source would have custom selectors in config
+            item_selector = config.get('item_selector', 'div')
+            item_class = config.get('item_class')
+            # Same fallback as response.text(): the header charset, else UTF-8
+            encoding = response.charset or 'utf-8'
+            
+            if isinstance(item_selector, str) and (item_class is None or isinstance(item_class, str)):
+                # Parse while downloading; stops as soon as enough items have been read
+                names = await stream_scraped_names(response, item_selector, item_class, encoding)
+            else:
+                # Tag/class lists and other bs4 filters fall back to a strained BeautifulSoup parse
+                html = await response.read()
+                strainer = SoupStrainer(item_selector, class_=item_class)
+                soup = BeautifulSoup(html, 'lxml', parse_only=strainer, from_encoding=encoding)
+                names = [item.get_text(strip=True) for item in soup.find_all(item_selector, class_=item_class, limit=SCRAPE_RESULT_LIMIT)]
+            
+            default_image = config.get('default_image', '')
+            
+            for name in names:
+                result = {
+                    'name': name,
+                    'price': 'N/A',
+                    'size': 'N/A',
+                    'producer': 'N/A',
+                    'release_date': 'N/A',
+                    'image': default_image,
+                    'link': url
+                }
+                results.append(result)
+            
+            return results
     except Exception as e:
         logger.error(f"Scraping error: {str(e)}")
         return []
 
-async def search_with_api(url: str, query: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+async def search_with_api(session: aiohttp.ClientSession, url: str, query: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
     """API-based search"""
     try:
-        async with aiohttp.ClientSession() as session:
-            headers = config.get('headers', {})
-            params = config.get('params', {})
-            params['q'] = query
+        headers = config.get('headers', {})
+        # Copy so the (possibly cached) source config is never mutated
+        params = {**config.get('params', {}), 'q': query}
+        
+        async with session.get(url, headers=headers, params=params) as response:
+            if response.status != 200:
+                return []
+            
+            data = await response.json()
             
-            async with session.get(url, headers=headers, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status != 200:
-                    return []
-                
-                data = await response.json()
-                
-                # Extract results based on config
-                results_path = config.get('results_path', 'results')
-                items = data.get(results_path, [])
-                
-                results = []
-                for item in items[:10]:
-                    result = {
-                        'name': item.get(config.get('name_field', 'name'), 'N/A'),
-                        'price': item.get(config.get('price_field', 'price'), 'N/A'),
-                        'size': item.get(config.get('size_field', 'size'), 'N/A'),
-                        'producer': item.get(config.get('producer_field', 'producer'), 'N/A'),
-                        'release_date': item.get(config.get('date_field', 'release_date'), 'N/A'),
-                        'image': item.get(config.get('image_field', 'image'), ''),
-                        'link': item.get(config.get('link_field', 'url'), url)
-                    }
-                    results.append(result)
-                
-                return results
+            # Extract results based on config
+            results_path = config.get('results_path', 'results')
+            items = data.get(results_path, [])
+            
+            # Resolve field names once instead of per item
+            name_f = config.get('name_field', 'name')
+            price_f = config.get('price_field', 'price')
+            size_f = config.get('size_field', 'size')
+            producer_f = config.get('producer_field', 'producer')
+            date_f = config.get('date_field', 'release_date')
+            image_f = config.get('image_field', 'image')
+            link_f = config.get('link_field', 'url')
+            
+            results = []
+            for item in items[:10]:
+                result = {
+                    'name': item.get(name_f, 'N/A'),
+                    'price': item.get(price_f, 'N/A'),
+                    'size': item.get(size_f, 'N/A'),
+                    'producer': item.get(producer_f, 'N/A'),
+                    'release_date': item.get(date_f, 'N/A'),
+                    'image': item.get(image_f, ''),
+                    'link': item.get(link_f, url)
+                }
+                results.append(result)
+            
+            return results
     except Exception as e:
         logger.error(f"API error: {str(e)}")
         return []
 
+# Per-(source id, query) result cache; empty results expire sooner so failures retry quickly
+SEARCH_CACHE_TTL = 300
+SEARCH_CACHE_EMPTY_TTL = 30
+SEARCH_CACHE_MAX_ENTRIES = 500
+SEARCH_RESULT_CACHE: "OrderedDict[Tuple[str, str], Tuple[float, SearchResult]]" = OrderedDict()
+
+def cache_search_results(func):
+    """Serve repeated source searches from SEARCH_RESULT_CACHE (LRU with TTL)"""
+    @functools.wraps(func)
+    async def wrapper(source: Dict[str, Any], query: str) -> SearchResult:
+        key = (source['id'], query.lower())
+        now = time.monotonic()
+        
+        cached = SEARCH_RESULT_CACHE.get(key)
+        if cached and cached[0] > now:
+            SEARCH_RESULT_CACHE.move_to_end(key)
+            return cached[1]
+        
+        result = await func(source, query)
+        
+        ttl = SEARCH_CACHE_TTL if result.items else SEARCH_CACHE_EMPTY_TTL
+        SEARCH_RESULT_CACHE[key] = (now + ttl, result)
+        SEARCH_RESULT_CACHE.move_to_end(key)
+        while len(SEARCH_RESULT_CACHE) > SEARCH_CACHE_MAX_ENTRIES:
+            SEARCH_RESULT_CACHE.popitem(last=False)
+        
+        return result
+    return wrapper
+
+@cache_search_results
 async def search_single_source(source: Dict[str, Any], query: str) -> SearchResult:
     """Search a single source"""
     try:
+        session = app.state.http_session
         if source['search_method'] == 'api':
-            items = await search_with_api(source['url_base'], query, source.get('config', {}))
+            items = await search_with_api(session, source['url_base'], query, source.get('config', {}))
         else:
-            items = await search_with_scraping(source['url_base'], query, source.get('config', {}))
+            items = await search_with_scraping(session, source['url_base'], query, source.get('config', {}), source.get('_url_template'))
         
         return SearchResult(source_name=source['name'], items=items)
     except Exception as e:
@@ -230,23 +459,127 @@ async def search_single_source(source: Dict[str, Any], query: str) -> SearchResu
 
 @api_router.post("/search", response_model=List[SearchResult])
 async def search(request: SearchRequest):
-    # Get sources to search
+    # Get sources to search, from the in-process cache when possible
+    await ensure_source_cache()
+    
     if request.source_ids:
-        sources = await db.sources.find({"id": {"$in": request.source_ids}, "enabled": True}, {"_id": 0}).to_list(100)
+        ids = list(dict.fromkeys(request.source_ids))
+        if all(id in SOURCE_BY_ID for id in ids):
+            sources = [SOURCE_BY_ID[id] for id in ids if SOURCE_BY_ID[id]['enabled']]
+        else:
+            sources = await find_sources({"id": {"$in": request.source_ids}, "enabled": True}, limit=100)
+    elif request.type in SOURCE_CACHE:
+        sources = SOURCE_CACHE[request.type]
     else:
-        sources = await db.sources.find({"type": request.type, "enabled": True}, {"_id": 0}).to_list(100)
+        sources = await find_sources({"type": request.type, "enabled": True}, limit=100)
     
     if not sources:
         return []
     
-    # Search all sources concurrently
-    tasks = [search_single_source(source, request.query) for source in sources]
+    # Search all sources concurrently, capped so one request can't drain the connector
+    sem = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    
+    async def bounded_search(source: Dict[str, Any]) -> SearchResult:
+        async with sem:
+            return await search_single_source(source, request.query)
+    
+    tasks = [bounded_search(source) for source in sources]
     results = await asyncio.gather(*tasks)
     
     return results
 
 
 # Seed initial data
+# Static definitions only; id, enabled and created_at are filled in per seed
+INITIAL_SOURCES = [
+    # Games
+    {
+        "name": "Steam",
+        "type": "game",
+        "url_base": "https://store.steampowered.com/search/?term={query}",
+        "search_method": "scraping",
+        "config": {
+            "item_selector": "a",
+            "item_class": "search_result_row",
+            "default_image": "https://placehold.co/300x400/6366f1/ffffff?text=Steam"
+        }
+    },
+    {
+        "name": "Epic Games",
+        "type": "game",
+        "url_base": "https://www.epicgames.com/store/browse?q={query}",
+        "search_method": "scraping",
+        "config": {
+            "default_image": "https://placehold.co/300x400/8b5cf6/ffffff?text=Epic+Games"
+        }
+    },
+    {
+        "name": "GOG",
+        "type": "game",
+        "url_base": "https://www.gog.com/games?query={query}",
+        "search_method": "scraping",
+        "config": {
+            "default_image": "https://placehold.co/300x400/ec4899/ffffff?text=GOG"
+        }
+    },
+    # Movies
+    {
+        "name": "IMDb",
+        "type": "movie",
+        "url_base": "https://www.imdb.com/find?q={query}&s=tt&ttype=ft",
+        "search_method": "scraping",
+        "config": {
+            "default_image": "https://placehold.co/300x400/f59e0b/ffffff?text=IMDb"
+        }
+    },
+    {
+        "name": "Netflix",
+        "type": "movie",
+        "url_base": "https://www.netflix.com/search?q={query}",
+        "search_method": "scraping",
+        "config": {
+            "default_image": "https://placehold.co/300x400/dc2626/ffffff?text=Netflix"
+        }
+    },
+    {
+        "name": "Prime Video",
+        "type": "movie",
+        "url_base": "https://www.primevideo.com/search?phrase={query}",
+        "search_method": "scraping",
+        "config": {
+            "default_image": "https://placehold.co/300x400/06b6d4/ffffff?text=Prime+Video"
+        }
+    },
+    # Animes
+    {
+        "name": "MyAnimeList",
+        "type": "anime",
+        "url_base": "https://myanimelist.net/anime.php?q={query}",
+        "search_method": "scraping",
+        "config": {
+            "default_image": "https://placehold.co/300x400/2563eb/ffffff?text=MyAnimeList"
+        }
+    },
+    {
+        "name": "Crunchyroll",
+        "type": "anime",
+        "url_base": "https://www.crunchyroll.com/search?q={query}",
+        "search_method": "scraping",
+        "config": {
+            "default_image": "https://placehold.co/300x400/f97316/ffffff?text=Crunchyroll"
+        }
+    },
+    {
+        "name": "AniList",
+        "type": "anime",
+        "url_base": "https://anilist.co/search/anime?search={query}",
+        "search_method": "scraping",
+        "config": {
+            "default_image": "https://placehold.co/300x400/8b5cf6/ffffff?text=AniList"
+        }
+    }
+]
+
 @api_router.post("/seed")
 async def seed_data():
     # Check if already seeded
@@ -254,123 +587,15 @@ async def seed_data():
     if count > 0:
         return {"message": "Database already seeded"}
     
+    now = datetime.now(timezone.utc)
     initial_sources = [
-        # Games
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Steam",
-            "type": "game",
-            "url_base": "https://store.steampowered.com/search/?term={query}",
-            "search_method": "scraping",
-            "config": {
-                "item_selector": "a",
-                "item_class": "search_result_row",
-                "default_image": "https://placehold.co/300x400/6366f1/ffffff?text=Steam"
-            },
-            "enabled": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Epic Games",
-            "type": "game",
-            "url_base": "https://www.epicgames.com/store/browse?q={query}",
-            "search_method": "scraping",
-            "config": {
-                "default_image": "https://placehold.co/300x400/8b5cf6/ffffff?text=Epic+Games"
-            },
-            "enabled": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "GOG",
-            "type": "game",
-            "url_base": "https://www.gog.com/games?query={query}",
-            "search_method": "scraping",
-            "config": {
-                "default_image": "https://placehold.co/300x400/ec4899/ffffff?text=GOG"
-            },
-            "enabled": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        },
-        # Movies
-        {
-            "id": str(uuid.uuid4()),
-            "name": "IMDb",
-            "type": "movie",
-            "url_base": "https://www.imdb.com/find?q={query}&s=tt&ttype=ft",
-            "search_method": "scraping",
-            "config": {
-                "default_image": "https://placehold.co/300x400/f59e0b/ffffff?text=IMDb"
-            },
-            "enabled": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Netflix",
-            "type": "movie",
-            "url_base": "https://www.netflix.com/search?q={query}",
-            "search_method": "scraping",
-            "config": {
-                "default_image": "https://placehold.co/300x400/dc2626/ffffff?text=Netflix"
-            },
-            "enabled": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Prime Video",
-            "type": "movie",
-            "url_base": "https://www.primevideo.com/search?phrase={query}",
-            "search_method": "scraping",
-            "config": {
-                "default_image": "https://placehold.co/300x400/06b6d4/ffffff?text=Prime+Video"
-            },
-            "enabled": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        },
-        # Animes
-        {
-            "id": str(uuid.uuid4()),
-            "name": "MyAnimeList",
-            "type": "anime",
-            "url_base": "https://myanimelist.net/anime.php?q={query}",
-            "search_method": "scraping",
-            "config": {
-                "default_image": "https://placehold.co/300x400/2563eb/ffffff?text=MyAnimeList"
-            },
-            "enabled": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "Crunchyroll",
-            "type": "anime",
-            "url_base": "https://www.crunchyroll.com/search?q={query}",
-            "search_method": "scraping",
-            "config": {
-                "default_image": "https://placehold.co/300x400/f97316/ffffff?text=Crunchyroll"
-            },
-            "enabled": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "name": "AniList",
-            "type": "anime",
-            "url_base": "https://anilist.co/search/anime?search={query}",
-            "search_method": "scraping",
-            "config": {
-                "default_image": "https://placehold.co/300x400/8b5cf6/ffffff?text=AniList"
-            },
-            "enabled": True,
-            "created_at": datetime.now(timezone.utc).isoformat()
-        }
+        {"id": str(uuid.uuid4()), **source, "enabled": True, "created_at": now}
+        for source in INITIAL_SOURCES
     ]
     
-    await db.sources.insert_many(initial_sources)
+    await ensure_indexes()
+    await db.sources.insert_many(initial_sources, ordered=False)
+    await invalidate_source_caches()
     
     return {"message": "Database seeded successfully", "count": len(initial_sources)}
 
@@ -399,6 +624,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_db():
+    # Don't block startup on Mongo; the source caches load lazily on first request
+    try:
+        await ensure_indexes()
+        await migrate_created_at()
+        await refresh_source_cache()
+    except Exception as e:
+        logger.error(f"Startup database setup failed: {str(e)}")
+
+@app.on_event("startup")
+async def startup_http_session():
+    # One pooled session for all outbound searches (keep-alive + DNS cache)
+    app.state.http_session = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=10),
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=10, ttl_dns_cache=300)
+    )
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+    await app.state.http_session.close()
@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# server.py lives in backend/ and reads its Mongo settings at import time;
+# the client connects lazily, so placeholder values are enough for unit tests
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'test_database')
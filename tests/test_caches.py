@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import pytest
+
+import server
+from server import SearchResult, cache_search_results, compile_url_template
+
+
+@pytest.fixture(autouse=True)
+def empty_search_cache():
+    server.SEARCH_RESULT_CACHE.clear()
+    yield
+    server.SEARCH_RESULT_CACHE.clear()
+
+
+def counting_search(items):
+    calls = []
+
+    @cache_search_results
+    async def search(source, query):
+        calls.append((source['id'], query))
+        return SearchResult(source_name=source['name'], items=items)
+
+    return search, calls
+
+
+def source(id):
+    return {'id': id, 'name': f'Source {id}'}
+
+
+def test_repeated_search_is_served_from_cache():
+    search, calls = counting_search([{'name': 'GTA V'}])
+
+    first = asyncio.run(search(source('s1'), 'GTA'))
+    second = asyncio.run(search(source('s1'), 'gta'))
+
+    assert second is first
+    assert calls == [('s1', 'GTA')]
+
+
+def test_expired_entry_is_refetched():
+    search, calls = counting_search([{'name': 'GTA V'}])
+    asyncio.run(search(source('s1'), 'GTA'))
+
+    key = ('s1', 'gta')
+    _, result = server.SEARCH_RESULT_CACHE[key]
+    server.SEARCH_RESULT_CACHE[key] = (time.monotonic() - 1, result)
+    asyncio.run(search(source('s1'), 'GTA'))
+
+    assert len(calls) == 2
+
+
+def test_empty_results_get_the_shorter_ttl():
+    full, _ = counting_search([{'name': 'GTA V'}])
+    empty, _ = counting_search([])
+
+    before = time.monotonic()
+    asyncio.run(full(source('s1'), 'GTA'))
+    asyncio.run(empty(source('s2'), 'GTA'))
+    after = time.monotonic()
+
+    full_expiry, _ = server.SEARCH_RESULT_CACHE[('s1', 'gta')]
+    empty_expiry, _ = server.SEARCH_RESULT_CACHE[('s2', 'gta')]
+    assert before + server.SEARCH_CACHE_TTL <= full_expiry <= after + server.SEARCH_CACHE_TTL
+    assert before + server.SEARCH_CACHE_EMPTY_TTL <= empty_expiry <= after + server.SEARCH_CACHE_EMPTY_TTL
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    monkeypatch.setattr(server, 'SEARCH_CACHE_MAX_ENTRIES', 3)
+    search, calls = counting_search([{'name': 'GTA V'}])
+
+    for id in ('s1', 's2', 's3'):
+        asyncio.run(search(source(id), 'GTA'))
+    asyncio.run(search(source('s1'), 'GTA'))  # s1 becomes most recently used
+    asyncio.run(search(source('s4'), 'GTA'))
+
+    assert list(server.SEARCH_RESULT_CACHE) == [('s3', 'gta'), ('s1', 'gta'), ('s4', 'gta')]
+    assert len(calls) == 4
+
+
+def test_invalidate_source_caches_clears_search_results(monkeypatch):
+    async def refresh():
+        pass
+
+    monkeypatch.setattr(server, 'refresh_source_cache', refresh)
+    search, calls = counting_search([{'name': 'GTA V'}])
+    asyncio.run(search(source('s1'), 'GTA'))
+
+    asyncio.run(server.invalidate_source_caches())
+
+    assert not server.SEARCH_RESULT_CACHE
+    asyncio.run(search(source('s1'), 'GTA'))
+    assert len(calls) == 2
+
+
+def test_url_template_substitutes_quoted_query():
+    template = compile_url_template('https://www.imdb.com/find?q={query}&s=tt&ttype=ft')
+
+    assert template.substitute(q='GTA%20V') == 'https://www.imdb.com/find?q=GTA%20V&s=tt&ttype=ft'
+
+
+def test_url_template_keeps_literal_dollar_signs():
+    template = compile_url_template('https://example.com/search?price=$5&q={query}&cur=$')
+
+    assert template.substitute(q='halo') == 'https://example.com/search?price=$5&q=halo&cur=$'
+
+
+def test_expired_source_cache_reloads_once_under_concurrency(monkeypatch):
+    reloads = []
+
+    async def refresh():
+        reloads.append(1)
+        await asyncio.sleep(0.01)
+        monkeypatch.setattr(server, 'SOURCE_CACHE_LOADED_AT', time.monotonic())
+
+    async def many_requests():
+        await asyncio.gather(*(server.ensure_source_cache() for _ in range(20)))
+
+    monkeypatch.setattr(server, 'refresh_source_cache', refresh)
+    monkeypatch.setattr(server, 'SOURCE_CACHE_LOADED_AT', None)
+    monkeypatch.setattr(server, 'SOURCE_CACHE_LOCK', asyncio.Lock())
+
+    asyncio.run(many_requests())
+
+    assert len(reloads) == 1
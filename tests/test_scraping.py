@@ -0,0 +1,151 @@
+import asyncio
+
+import server
+from server import ScrapedItemParser, stream_scraped_names
+
+
+def feed_in_chunks(parser, html: bytes, size: int):
+    names = []
+    for i in range(0, len(html), size):
+        names.extend(parser.feed(html[i:i + size]))
+    names.extend(parser.close())
+    return names
+
+
+class FakeContent:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+
+    async def iter_chunked(self, size):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+class FakeResponse:
+    def __init__(self, chunks):
+        self.content = FakeContent(chunks)
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_match_split_across_chunk_boundary():
+    html = b'<html><body><a class="row">Grand Theft Auto</a></body></html>'
+    split = html.index(b'Theft')
+
+    parser = ScrapedItemParser('a', 'row')
+    names = parser.feed(html[:split]) + parser.feed(html[split:]) + parser.close()
+
+    assert names == ['Grand Theft Auto']
+
+
+def test_small_chunks_match_single_feed():
+    html = b'<html><body>' + b''.join(b'<a class="row">Game %d</a>' % i for i in range(5)) + b'</body></html>'
+
+    assert feed_in_chunks(ScrapedItemParser('a', 'row'), html, 3) == [f'Game {i}' for i in range(5)]
+
+
+def test_nested_matches_in_document_order():
+    html = b'<html><body><div><div>a</div>b<div><div>c</div></div></div><div>d</div></body></html>'
+
+    names = feed_in_chunks(ScrapedItemParser('div', None), html, 5)
+
+    assert names == ['abc', 'a', 'c', 'c', 'd']
+
+
+def test_class_filtering():
+    html = (
+        b'<html><body>'
+        b'<div class="result big">one</div>'
+        b'<div class="other">two</div>'
+        b'<div>three</div>'
+        b'</body></html>'
+    )
+
+    assert feed_in_chunks(ScrapedItemParser('div', 'result'), html, 8) == ['one']
+    assert feed_in_chunks(ScrapedItemParser('div', 'result big'), html, 8) == ['one']
+    assert feed_in_chunks(ScrapedItemParser('div', 'big result'), html, 8) == []
+    # Like find_all(tag, class_=None): only tags without a class attribute
+    assert feed_in_chunks(ScrapedItemParser('div', None), html, 8) == ['three']
+
+
+def test_script_and_style_text_skipped():
+    html = b'<html><body><div class="r">Title<script>var x = 1;</script><style>p {}</style></div></body></html>'
+
+    assert feed_in_chunks(ScrapedItemParser('div', 'r'), html, 4) == ['Title']
+
+
+def test_empty_body():
+    assert ScrapedItemParser('div', None).close() == []
+
+
+def test_stream_stops_at_result_limit():
+    chunks = [b'<html><body>'] + [b'<a class="r">%d</a>' % i for i in range(50)] + [b'</body></html>']
+    response = FakeResponse(chunks)
+
+    names = asyncio.run(stream_scraped_names(response, 'a', 'r'))
+
+    assert names == [str(i) for i in range(server.SCRAPE_RESULT_LIMIT)]
+    assert response.closed
+    assert response.content.read < len(chunks)
+
+
+def test_stream_reads_short_page_to_the_end():
+    response = FakeResponse([b'<html><body><a class="r">only</a>', b'</body></html>'])
+
+    assert asyncio.run(stream_scraped_names(response, 'a', 'r')) == ['only']
+    assert not response.closed
+
+
+def test_stream_empty_body():
+    assert asyncio.run(stream_scraped_names(FakeResponse([]), 'a', 'r')) == []
+
+
+class FakeScrapeResponse(FakeResponse):
+    status = 200
+    charset = 'utf-8'
+
+    def __init__(self, body: bytes):
+        super().__init__([body])
+        self.body = body
+
+    async def read(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def get(self, url, **kwargs):
+        return FakeScrapeResponse(self.body)
+
+
+def scrape(body: bytes, config):
+    session = FakeSession(body)
+    return asyncio.run(server.search_with_scraping(session, 'https://example.com/?q={query}', 'GTA', config))
+
+
+def test_scraping_streams_string_selectors():
+    body = b'<html><body><a class="r">x</a><div class="r">y</div></body></html>'
+
+    items = scrape(body, {'item_selector': 'a', 'item_class': 'r'})
+
+    assert [item['name'] for item in items] == ['x']
+
+
+def test_scraping_list_selector_uses_beautifulsoup_fallback():
+    body = b'<html><body><a>x</a><div>y</div></body></html>'
+
+    items = scrape(body, {'item_selector': ['a', 'div']})
+
+    assert [item['name'] for item in items] == ['x', 'y']